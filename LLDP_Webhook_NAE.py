@@ -13,6 +13,26 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Serialize webhook payloads straight to bytes, preferring orjson when available
+try:
+    from orjson import dumps as dumps_json
+except ImportError:
+    import json
+
+    def dumps_json(payload):
+        return json.dumps(payload).encode('utf-8')
+
 
 Manifest = {
     'Name': 'LLDP_Webhook_Simple',
@@ -23,6 +43,8 @@ Manifest = {
     'AOSCXVersionMin': '10.11'
 }
 
+DEFAULT_WEBHOOK_URL = 'https://webhook.site/your-webhook-id'
+
 ParameterDefinitions = {
     'interfaces': {
         'Name': 'Monitored Interfaces',
@@ -34,18 +56,48 @@ ParameterDefinitions = {
         'Name': 'Webhook URL',
         'Description': 'URL to send the webhook notification to',
         'Type': 'string',
-        'Default': 'https://webhook.site/your-webhook-id'
+        'Default': DEFAULT_WEBHOOK_URL
     },
     'lldp_wait_time': {
         'Name': 'LLDP Discovery Wait Time',
         'Description': 'Time in seconds to wait for LLDP discovery after interface comes up (5-60)',
         'Type': 'integer',
         'Default': 15
+    },
+    'max_batch_size': {
+        'Name': 'Maximum Batch Size',
+        'Description': 'Maximum number of interface events sent in a single webhook notification',
+        'Type': 'integer',
+        'Default': 32
+    },
+    'max_wait_ms': {
+        'Name': 'Batch Window',
+        'Description': 'Extra time in milliseconds to wait after the LLDP wait time so interface events coming up shortly after are grouped into the same webhook notification',
+        'Type': 'integer',
+        'Default': 500
+    },
+    'min_event_interval_s': {
+        'Name': 'Minimum Event Interval',
+        'Description': 'Time in seconds during which repeated interface up events on the same interface are ignored (0 to disable)',
+        'Type': 'integer',
+        'Default': 30
     }
 }
 
 URI_PREFIX_GET = "/rest/v10.08/"
 URI_PREFIX_MONITOR = "/rest/v1/"
+WEBHOOK_TIMEOUT = (3, 10)  # (connect, read) seconds
+
+# Adaptive concurrency (AIMD) for outbound webhook posts
+CWND_INITIAL = 4
+CWND_MAX = 32
+CWND_ALPHA = 0.5  # additive increase per successful post
+CWND_BETA = 0.5  # multiplicative decrease on timeout/429/5xx
+TARGET_LATENCY = 2.0  # seconds
+ADMIT_TIMEOUT = 30  # seconds to wait for a slot before dropping a post
+LLDP_WORKERS = 8  # concurrent LLDP lookups against the switch REST API
+LLDP_TIMEOUT = 10  # seconds to wait for a single LLDP lookup
+COOLDOWN_PRUNE_INTERVAL = 3600  # seconds between cleanups of the flap history
 
 
 class Agent(NAE):
@@ -62,6 +114,32 @@ class Agent(NAE):
             self.r1.condition('transition {} from "down" to "up"', [self.m1])
             self.r1.action(self.handle_interface_up)
             
+            # Base URL of the switch REST API
+            self.base_url = HTTP_ADDRESS + URI_PREFIX_GET
+            
+            # Last handled event per interface, used to suppress link flaps
+            self.last_event = {}
+            self.last_prune = time.monotonic()
+            
+            # Interfaces waiting on LLDP discovery, mapped to (deadline, flush time)
+            self.pending = {}
+            self.pending_lock = threading.Lock()
+            
+            # Worker threads for I/O bound REST lookups
+            self.pool = ThreadPoolExecutor(max_workers=LLDP_WORKERS)
+            
+            # Persistent HTTP session so webhook posts reuse warm connections
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=100, max_retries=0)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+            
+            # Congestion window limiting concurrent webhook posts
+            self.cwnd = CWND_INITIAL
+            self.inflight = 0
+            self.backoff_until = 0
+            self.cwnd_cond = threading.Condition()
+            
             # Log rule creation
             ActionSyslog("LLDP_Webhook: Agent initialized and monitoring interface state changes")
         except Exception as e:
@@ -84,8 +162,7 @@ class Agent(NAE):
             self.init_global()
             
             # Test if webhook URL is configured and log it
-            webhook_url = str(self.params.get('webhook_url', ''))
-            if webhook_url and webhook_url != 'https://webhook.site/your-webhook-id':
+            if self.webhook_valid:
                 self.logger.info("Configured webhook URL")
                 ActionSyslog("LLDP_Webhook: Configured with webhook URL")
             else:
@@ -93,7 +170,7 @@ class Agent(NAE):
                 ActionSyslog("LLDP_Webhook: WARNING - Webhook URL not properly configured")
                 
             # Send a test webhook
-            self.send_test_webhook()
+            self.start_test_webhook()
         except Exception as e:
             self.logger.error(f"Error during agent start: {str(e)}")
             ActionSyslog(f"LLDP_Webhook: Error during agent start: {str(e)}")
@@ -107,21 +184,55 @@ class Agent(NAE):
         # Create the list of monitored interfaces
         if str(self.params['interfaces']) == "all":
             self.monitor_all_interfaces = True
-            self.ports_list = set()
+            self.ports_list = frozenset()
         else:
             self.monitor_all_interfaces = False
             self.create_interfaces_list()
         
+        # Webhook endpoint and headers shared by every notification
+        self.webhook_url = str(self.params.get('webhook_url') or '').strip()
+        self.webhook_valid = bool(self.webhook_url) and self.webhook_url != DEFAULT_WEBHOOK_URL
+        self.webhook_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        
+        # Numeric parameters, parsed and clamped once rather than per event
+        self.lldp_wait_time = self.get_int_param('lldp_wait_time', 15, 5, 60)
+        self.min_event_interval = self.get_int_param('min_event_interval_s', 30, 0)
+        self.max_batch_size = self.get_int_param('max_batch_size', 32, 1)
+        self.max_wait_ms = self.get_int_param('max_wait_ms', 500, 0)
+        
         # Get the switch hostname for webhook payload
         self.get_switch_hostname()
 
+    def get_int_param(self, name, default, minimum, maximum=None):
+        """
+        Desc: Read an integer parameter, clamped to the given bounds
+        Args:
+            name - parameter name
+            default - value used when the parameter is missing or invalid
+            minimum - lowest accepted value
+            maximum - highest accepted value, or None for no upper bound
+        Retn: Integer value
+        """
+        try:
+            value = int(self.params.get(name, default))
+        except (TypeError, ValueError):
+            self.logger.warning(f"Invalid value for parameter {name}, using {default}")
+            return default
+        value = max(minimum, value)
+        if maximum is not None:
+            value = min(maximum, value)
+        return value
+
     def get_switch_hostname(self):
         """
         Desc: Get the switch hostname for inclusion in webhook payload
         Args: None
         Retn: None
         """
-        url = "{}{}system".format(HTTP_ADDRESS, URI_PREFIX_GET)
+        url = self.base_url + "system"
         try:
             system_info = self.get_rest_request_json(url)
             if system_info and 'hostname' in system_info:
@@ -140,61 +251,50 @@ class Agent(NAE):
         Args: None
         Retn: None
         """
-        self.ports_list = set(str(self.params['interfaces']).split(','))
+        tokens = str(self.params['interfaces']).split(',')
+        self.ports_list = frozenset(
+            itertools.chain.from_iterable(self.expand_port(token) for token in tokens)
+        )
 
-        # Process ranges like 1/1/1-1/1/10
-        ports_to_remove = set()
-        ports_to_add = set()
+    def expand_port(self, port):
+        """
+        Desc: Expand a single entry of the interfaces parameter
+        Args: port - a port name or a range like 1/1/1-10
+        Retn: Generator of port names
+        """
+        if "-" not in port:
+            yield port
+            return
         
-        for port in self.ports_list:
-            if "-" in port:
-                try:
-                    ports_to_remove.add(port)
-                    tmp_list = port.split('-')
-                    
-                    # Simple case: expand ports only for third segment (1/1/1-10)
-                    if len(tmp_list) == 2 and "/" in tmp_list[0]:
-                        base_parts = tmp_list[0].split('/')
-                        
-                        # If second part is just a number (1/1/1-10)
-                        if tmp_list[1].isdigit():
-                            start_num = int(base_parts[-1])
-                            end_num = int(tmp_list[1])
-                            prefix = '/'.join(base_parts[:-1]) + '/'
-                            
-                            # Add all ports in the range
-                            for i in range(start_num, end_num + 1):
-                                ports_to_add.add(f"{prefix}{i}")
-                except Exception as e:
-                    self.logger.error(f"Error parsing port range {port}: {str(e)}")
+        try:
+            start, _, end = port.partition('-')
+            prefix, sep, start_num = start.rpartition('/')
+            
+            # Simple case: expand ports only for third segment (1/1/1-10)
+            if not sep or not end.isdigit():
+                return
+            ports = range(int(start_num), int(end) + 1)
+        except Exception as e:
+            self.logger.error(f"Error parsing port range {port}: {str(e)}")
+            return
         
-        # Remove ranges and add expanded ports
-        self.ports_list = self.ports_list - ports_to_remove
-        self.ports_list.update(ports_to_add)
+        for i in ports:
+            yield f"{prefix}/{i}"
 
     def handle_interface_up(self, event):
         """
-        Desc: This function gathers LLDP info and sends a webhook notification
+        Desc: This function filters interface up events and queues monitored interfaces
+              for a deferred LLDP lookup and webhook notification
         Args: event - event which triggered the action of executing this function
         Retn: None
         """
         try:
-            # Log rule trigger
-            self.logger.info("Rule triggered: Interface Up Webhook Notification")
-            ActionSyslog("LLDP_Webhook: Rule triggered for interface state change")
-
-            # Extract the interface name from the event
+            # Cheap rejections first so ignored events cost next to nothing
             label = event['labels']
-            self.logger.info(f'Event labels: {label}')
-            
-            # Parse the interface from the label
             try:
-                parts = label.split(',')[0].split('=')
-                if len(parts) >= 2:
-                    interface_id = parts[1]
-                    self.logger.info(f"Detected interface: {interface_id}")
-                    ActionSyslog(f"LLDP_Webhook: Detected interface change on {interface_id}")
-                else:
+                head, _, _ = label.partition(',')
+                _, _, interface_id = head.partition('=')
+                if not interface_id:
                     self.logger.error(f"Failed to parse interface from label: {label}")
                     return
             except Exception as e:
@@ -202,203 +302,228 @@ class Agent(NAE):
                 ActionSyslog("LLDP_Webhook: Failed to parse interface from event")
                 return
             
-            # Make sure hostname is initialized
-            if not hasattr(self, 'hostname'):
-                self.hostname = "Unknown"
-                self.logger.warning("Hostname not initialized, using 'Unknown'")
+            # Nothing to do without a webhook (already reported at agent start)
+            if not self.webhook_valid:
+                return
             
             # Check if this interface should be monitored
-            if hasattr(self, 'monitor_all_interfaces'):
-                if not self.monitor_all_interfaces and interface_id not in self.ports_list:
-                    self.logger.info(f"Interface {interface_id} not in monitored list, ignoring")
-                    return
-            
-            # Get LLDP wait time from parameters (with validation)
-            try:
-                lldp_wait_time = int(self.params.get('lldp_wait_time', 15))
-                if lldp_wait_time < 5:
-                    lldp_wait_time = 5  # Minimum wait time
-                elif lldp_wait_time > 60:
-                    lldp_wait_time = 60  # Maximum wait time
-            except:
-                lldp_wait_time = 15  # Default if parameter is invalid
-            
-            # LLDP discovery takes time - wait for it before proceeding
-            self.logger.info(f"Waiting {lldp_wait_time} seconds for LLDP discovery on interface {interface_id}")
-            ActionSyslog(f"LLDP_Webhook: Waiting {lldp_wait_time} seconds for LLDP discovery")
-            
-            import time
-            time.sleep(lldp_wait_time)  # Use configurable wait time
-            
-            # Get LLDP information for this interface
-            lldp_data = self.get_lldp_info(interface_id)
-            
-            # Log LLDP neighbors count
-            if lldp_data:
-                neighbor_count = len(lldp_data)
-                self.logger.info(f"Found {neighbor_count} LLDP neighbors for {interface_id}")
-                ActionSyslog(f"LLDP_Webhook: Found {neighbor_count} LLDP neighbors for {interface_id}")
-            else:
-                self.logger.info(f"No LLDP neighbors for {interface_id}")
-                ActionSyslog(f"LLDP_Webhook: No LLDP neighbors for {interface_id}")
+            if not self.monitor_all_interfaces and interface_id not in self.ports_list:
+                return
             
-            # Prepare and send webhook notification
-            self.send_webhook(interface_id, lldp_data)
+            # Ignore repeated events while the interface is flapping
+            now = time.monotonic()
+            last = self.last_event.get(interface_id)
+            if last is not None and now - last < self.min_event_interval:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"Interface {interface_id} came up again within {self.min_event_interval} seconds, ignoring")
+                return
+            self.last_event[interface_id] = now
+            self.prune_last_event(now)
+            
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f'Rule triggered, event labels: {label}')
+            
+            # LLDP discovery takes time - defer the lookup instead of blocking
+            # the agent thread, so other interface events are handled meanwhile
+            ActionSyslog(f"LLDP_Webhook: Interface {interface_id} up, waiting {self.lldp_wait_time} seconds for LLDP discovery")
+            
+            deadline = now + self.lldp_wait_time
+            flush_at = deadline + self.max_wait_ms / 1000.0
+            with self.pending_lock:
+                self.pending[interface_id] = (deadline, flush_at)
+            timer = threading.Timer(flush_at - now, self.flush_pending)
+            timer.daemon = True
+            timer.start()
         
         except Exception as e:
             self.logger.error(f"Exception in webhook notification handler: {str(e)}")
             ActionSyslog(f"LLDP_Webhook: Exception in notification handler: {str(e)}")
 
+    def prune_last_event(self, now):
+        """
+        Desc: Periodically drop flap history entries older than the event interval
+        Args: now - current monotonic time
+        Retn: None
+        """
+        if now - self.last_prune < COOLDOWN_PRUNE_INTERVAL:
+            return
+        self.last_prune = now
+        self.last_event = {
+            port: last for port, last in self.last_event.items()
+            if now - last < self.min_event_interval
+        }
+
+    def flush_pending(self):
+        """
+        Desc: Gathers LLDP info for every interface whose discovery wait has elapsed
+              and sends them in batched webhook notifications
+        Args: None
+        Retn: None
+        """
+        try:
+            while True:
+                # Only interfaces whose LLDP wait has fully elapsed are sent. The
+                # batch is held until one of them reaches the flush time fixed
+                # when it was queued (its deadline plus max_wait_ms), so
+                # interfaces coming up shortly after join it. Every entry has a
+                # timer armed for its own flush time, so none is left behind.
+                now = time.monotonic()
+                with self.pending_lock:
+                    ready = sorted(
+                        (deadline, flush_at, port) for port, (deadline, flush_at) in self.pending.items()
+                        if deadline <= now
+                    )
+                    if not any(flush_at <= now for _, flush_at, _ in ready):
+                        return
+                    due = [port for _, _, port in ready[:self.max_batch_size]]
+                    for port in due:
+                        del self.pending[port]
+                
+                # Get LLDP information for these interfaces concurrently
+                futures = [(port, self.pool.submit(self.get_lldp_info, port)) for port in due]
+                events = []
+                for port, future in futures:
+                    lldp_error = None
+                    try:
+                        lldp_data = future.result(timeout=LLDP_TIMEOUT)
+                        if lldp_data is None:
+                            lldp_error = "request failed"
+                    except FutureTimeoutError:
+                        # Don't let a lookup still queued behind a busy pool hit the REST API later
+                        future.cancel()
+                        self.logger.error(f"Timed out getting LLDP info for {port}")
+                        lldp_data, lldp_error = None, "timeout"
+                    except Exception as e:
+                        self.logger.error(f"Failed to get LLDP info for {port}: {str(e)}")
+                        lldp_data, lldp_error = None, "request failed"
+                    events.append((port, lldp_data, lldp_error))
+                
+                # Prepare and send webhook notification
+                self.send_webhook(events)
+        
+        except Exception as e:
+            self.logger.error(f"Exception in deferred LLDP handler: {str(e)}")
+            ActionSyslog(f"LLDP_Webhook: Exception in deferred LLDP handler: {str(e)}")
+
     def get_lldp_info(self, port):
         """
         Desc: Gathers the LLDP information related to the specified interface
         Args: port - name of the port
-        Retn: LLDP information dictionary
+        Retn: LLDP information dictionary, or None if the lookup failed
         """
         try:
-            port_name = str(port).replace("/", "%2F")
-            url_lldp = "{}{}system/interfaces/{}/lldp_neighbors?depth=2".format(
-                HTTP_ADDRESS, URI_PREFIX_GET, port_name)
+            port_name = quote(str(port), safe='')
+            url_lldp = f"{self.base_url}system/interfaces/{port_name}/lldp_neighbors?depth=2"
             
-            self.logger.info(f"Getting LLDP neighbors from: {url_lldp}")
             lldp_data = self.get_rest_request_json(url_lldp)
             
             # Log the raw LLDP data for debugging
-            self.logger.info(f"Raw LLDP data: {lldp_data}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Raw LLDP data from {url_lldp}: {lldp_data}")
             
-            if lldp_data and len(lldp_data) > 0:
-                self.logger.info(f"Found {len(lldp_data)} LLDP neighbors for {port}")
-                
-                # Attempt a second retrieval to ensure complete data
-                # (no need for additional delay since we already waited in the main handler)
-                lldp_data = self.get_rest_request_json(url_lldp)
-                self.logger.info("Retrieved LLDP data second time")
-                
-                return lldp_data
-            else:
-                self.logger.info(f"No LLDP neighbors found for {port}")
-                return {}
+            return lldp_data or {}
         except Exception as e:
             self.logger.error(f"Error getting LLDP info: {str(e)}")
-            return {}
+            return None
 
-    def send_webhook(self, port, lldp_data):
+    def send_webhook(self, events):
         """
-        Desc: Send webhook notification with port and LLDP info
+        Desc: Send a single webhook notification with port and LLDP info for a batch of events
         Args: 
-            port - the port that triggered the event
-            lldp_data - LLDP information for the port
+            events - list of (port, lldp_data, lldp_error) tuples, one per interface that came up;
+                     lldp_error is None when the LLDP lookup succeeded
         Retn: None
         """
+        ports = ", ".join(port for port, _, _ in events)
         try:
-            import json
-            
-            # Log that we're attempting to send a notification
-            self.logger.info(f"Preparing webhook notification for port {port}")
+            debug = self.logger.isEnabledFor(logging.DEBUG)
             
-            # Get webhook URL
-            webhook_url = str(self.params.get('webhook_url', ''))
-            if not webhook_url or webhook_url == 'https://webhook.site/your-webhook-id':
+            # Check webhook URL
+            if not self.webhook_valid:
                 self.logger.error("Invalid webhook URL configured")
                 ActionSyslog("LLDP_Webhook: Invalid webhook URL")
                 return
             
-            # Make sure hostname is initialized
-            if not hasattr(self, 'hostname'):
-                self.hostname = "Unknown"
-                self.logger.warning("Hostname not initialized, using 'Unknown'")
-            
             # Prepare payload
             payload = {
                 "event_type": "interface_up",
                 "switch_hostname": self.hostname,
-                "interface": port,
                 "timestamp": self.get_current_time(),
-                "lldp_neighbors": []
+                "events": []
             }
             
-            # Add LLDP information if available
-            lldp_neighbor_count = 0
-            if lldp_data and isinstance(lldp_data, dict) and len(lldp_data) > 0:
-                self.logger.info(f"Processing {len(lldp_data)} LLDP neighbors")
+            for port, lldp_data, lldp_error in events:
+                # Report failed lookups explicitly rather than as an empty neighbor list
+                if lldp_error:
+                    payload["events"].append({
+                        "interface": port,
+                        "lldp_neighbors": None,
+                        "lldp_error": lldp_error
+                    })
+                    continue
                 
-                for key, neighbor in lldp_data.items():
-                    self.logger.info(f"Processing LLDP neighbor with key: {key}")
-                    
-                    if isinstance(neighbor, dict) and 'neighbor_info' in neighbor:
-                        neighbor_info = neighbor['neighbor_info']
-                        self.logger.info(f"Neighbor info found: {neighbor_info}")
-                        
-                        # Extract remote device info
-                        remote_device = neighbor_info.get('chassis_name', '')
-                        if not remote_device and 'mgmt_ip_list' in neighbor_info:
-                            remote_device = neighbor_info.get('mgmt_ip_list', '')
-                        
-                        # Extract remote port info
-                        remote_port = neighbor_info.get('port_description', '')
+                neighbors = []
+                
+                # Add LLDP information if available (most access ports have none)
+                if isinstance(lldp_data, dict) and lldp_data:
+                    for neighbor in lldp_data.values():
+                        neighbor_info = neighbor.get('neighbor_info') if isinstance(neighbor, dict) else None
+                        if not neighbor_info:
+                            continue
                         
-                        # Add to payload
-                        neighbor_data = {
-                            "remote_device": remote_device,
-                            "remote_port": remote_port,
+                        mgmt_ip = neighbor_info.get('mgmt_ip_list', '')
+                        neighbors.append({
+                            "remote_device": neighbor_info.get('chassis_name') or mgmt_ip,
+                            "remote_port": neighbor_info.get('port_description', ''),
                             "chassis_id": neighbor_info.get('chassis_id', ''),
                             "capabilities": neighbor_info.get('capabilities', ''),
-                            "mgmt_ip": neighbor_info.get('mgmt_ip_list', '')
-                        }
-                        
-                        self.logger.info(f"Adding neighbor data: {neighbor_data}")
-                        payload["lldp_neighbors"].append(neighbor_data)
-                        lldp_neighbor_count += 1
-            
-            self.logger.info(f"Added {lldp_neighbor_count} LLDP neighbors to payload")
-            
-            # Set headers
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
+                            "mgmt_ip": mgmt_ip
+                        })
+                
+                if debug:
+                    self.logger.debug(f"Added {len(neighbors)} LLDP neighbors to payload for port {port}")
+                payload["events"].append({
+                    "interface": port,
+                    "lldp_neighbors": neighbors
+                })
             
             # Convert payload to JSON
-            json_str = json.dumps(payload)
+            body = dumps_json(payload)
             
             # Send webhook
-            self.logger.info(f"Sending webhook to {webhook_url}")
-            response = self.post_rest_request(
-                webhook_url,
-                headers=headers,
-                data=json_str,
-                verify=False  # Skip SSL verification
-            )
+            response = self.post_webhook(body)
             
             # Check response
             status_code = getattr(response, 'status_code', None)
             
             if status_code and status_code >= 200 and status_code < 300:
-                self.logger.info(f"Webhook notification sent successfully for port {port}")
-                ActionSyslog(f"LLDP_Webhook: Notification sent for port {port}")
+                self.logger.info(f"Webhook notification sent successfully for ports {ports}")
+                ActionSyslog(f"LLDP_Webhook: Notification sent for ports {ports}")
             else:
                 self.logger.error(f"Failed to send webhook notification: HTTP {status_code}")
-                ActionSyslog(f"LLDP_Webhook: Failed to send notification for port {port}: HTTP {status_code}")
+                ActionSyslog(f"LLDP_Webhook: Failed to send notification for ports {ports}: HTTP {status_code}")
         except Exception as e:
             self.logger.error(f"Exception when sending webhook: {str(e)}")
-            ActionSyslog(f"LLDP_Webhook: Exception when sending notification for port {port}: {str(e)}")
+            ActionSyslog(f"LLDP_Webhook: Exception when sending notification for ports {ports}: {str(e)}")
+
+    def start_test_webhook(self):
+        """
+        Desc: Send the test webhook on a background thread so a slow receiver
+              does not hold up the agent thread or the LLDP lookup workers
+        Args: None
+        Retn: None
+        """
+        thread = threading.Thread(target=self.send_test_webhook)
+        thread.daemon = True
+        thread.start()
 
     def send_test_webhook(self):
         """
         Sends a test webhook to verify connectivity
         """
         try:
-            import json
-            import datetime
-            
-            # Make sure hostname is initialized
-            if not hasattr(self, 'hostname'):
-                self.hostname = "Unknown"
-                self.logger.warning("Hostname not initialized, using 'Unknown'")
-            
-            # Get webhook URL
-            webhook_url = str(self.params.get('webhook_url', ''))
-            if not webhook_url or webhook_url == 'https://webhook.site/your-webhook-id':
+            # Check webhook URL
+            if not self.webhook_valid:
                 self.logger.error("Invalid webhook URL configured")
                 ActionSyslog("LLDP_Webhook: Invalid webhook URL for test")
                 return
@@ -408,25 +533,14 @@ class Agent(NAE):
                 "event_type": "test",
                 "switch_hostname": self.hostname,
                 "message": "This is a test webhook from LLDP_Webhook agent",
-                "timestamp": datetime.datetime.now().isoformat()
-            }
-            
-            # Set headers
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
+                "timestamp": self.get_current_time()
             }
             
             # Convert to JSON and send
-            json_str = json.dumps(payload)
-            self.logger.info(f"Sending test webhook to {webhook_url}")
-            
-            response = self.post_rest_request(
-                webhook_url,
-                headers=headers,
-                data=json_str,
-                verify=False
-            )
+            body = dumps_json(payload)
+            self.logger.info(f"Sending test webhook to {self.webhook_url}")
+            
+            response = self.post_webhook(body)
             
             # Check response
             status_code = getattr(response, 'status_code', None)
@@ -442,14 +556,88 @@ class Agent(NAE):
             self.logger.error(f"Error sending test webhook: {str(e)}")
             ActionSyslog(f"LLDP_Webhook: Error sending test webhook: {str(e)}")
 
+    def post_webhook(self, data):
+        """
+        Desc: POST to the webhook endpoint within the adaptive concurrency window
+        Args: data - request body
+        Retn: HTTP response, or None if no slot became available in time
+        """
+        if not self.admit_webhook():
+            self.logger.error("Webhook concurrency limit reached, dropping notification")
+            ActionSyslog("LLDP_Webhook: Webhook receiver overloaded, dropping notification")
+            return None
+        
+        start = time.monotonic()
+        response = None
+        try:
+            response = self.session.post(
+                self.webhook_url,
+                headers=self.webhook_headers,
+                data=data,
+                verify=False,  # Skip SSL verification
+                timeout=WEBHOOK_TIMEOUT,
+                allow_redirects=False  # Webhook endpoints should not redirect
+            )
+            return response
+        finally:
+            self.release_webhook(response, time.monotonic() - start)
+
+    def admit_webhook(self):
+        """
+        Desc: Wait for a free slot in the congestion window
+        Args: None
+        Retn: True if admitted, False if timed out
+        """
+        deadline = time.monotonic() + ADMIT_TIMEOUT
+        with self.cwnd_cond:
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    return False
+                if now < self.backoff_until:
+                    self.cwnd_cond.wait(min(self.backoff_until, deadline) - now)
+                elif self.inflight >= int(self.cwnd):
+                    self.cwnd_cond.wait(deadline - now)
+                else:
+                    self.inflight += 1
+                    return True
+
+    def release_webhook(self, response, latency):
+        """
+        Desc: Free a slot and adjust the congestion window from the outcome of a post
+        Args:
+            response - HTTP response, or None if the post raised
+            latency - time the post took in seconds
+        Retn: None
+        """
+        status_code = getattr(response, 'status_code', None)
+        resp_headers = getattr(response, 'headers', None) or {}
+        
+        # Honour server-side rate limiting hints
+        retry_after = 0
+        try:
+            retry_after = float(resp_headers.get('Retry-After', 0))
+        except (TypeError, ValueError):
+            pass
+        rate_limited = status_code == 429 or str(resp_headers.get('X-RateLimit-Remaining', '')) == '0'
+        
+        with self.cwnd_cond:
+            self.inflight -= 1
+            if status_code and 200 <= status_code < 300 and latency < TARGET_LATENCY and not rate_limited:
+                self.cwnd = min(CWND_MAX, self.cwnd + CWND_ALPHA)
+            elif status_code is None or status_code >= 500 or rate_limited or latency >= TARGET_LATENCY:
+                self.cwnd = max(1, self.cwnd * CWND_BETA)
+            if retry_after > 0:
+                self.backoff_until = max(self.backoff_until, time.monotonic() + retry_after)
+            self.cwnd_cond.notify_all()
+
     def get_current_time(self):
         """
-        Desc: Get current timestamp in ISO format
+        Desc: Get current UTC timestamp in ISO format
         Args: None
         Retn: Timestamp string
         """
-        import datetime
-        return datetime.datetime.now().isoformat()
+        return datetime.now(timezone.utc).isoformat(timespec='seconds')
 
     def on_agent_re_enable(self, event):
         """
@@ -468,7 +656,7 @@ class Agent(NAE):
             self.init_global()
             
             # Send a test webhook
-            self.send_test_webhook()
+            self.start_test_webhook()
         except Exception as e:
             self.logger.error(f"Error during agent re-enable: {str(e)}")
             ActionSyslog(f"LLDP_Webhook: Error during agent re-enable: {str(e)}")
\ No newline at end of file